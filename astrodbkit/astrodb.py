@@ -2,32 +2,57 @@
 
 __all__ = ["__version__", "Database", "or_", "and_", "create_database"]
 
+import contextlib
+import copy
+import functools
 import json
 import os
-import sqlite3
 import shutil
+import sqlite3
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import astropy.units as u
 import numpy as np
 import pandas as pd
 import sqlalchemy.types as sqlalchemy_types
 from astropy.coordinates import SkyCoord
 from astropy.table import Table as AstropyTable
 from astropy.units.quantity import Quantity
-from sqlalchemy import Table, and_, create_engine, event, or_, text
+from sqlalchemy import Table, and_, create_engine, event, func, literal, or_, select, text, union
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.orm.query import Query
+from sqlalchemy.pool import SingletonThreadPool
 from tqdm import tqdm
 
 from . import FOREIGN_KEY, PRIMARY_TABLE, PRIMARY_TABLE_KEY, REFERENCE_TABLES
-from .spectra import load_spectrum
-from .utils import datetime_json_parser, deprecated_alias, get_simbad_names, json_serializer
+from .spectra import load_spectrum  # also registers the specutils loaders for Spectrum1D.read
+from .utils import (
+    apply_datetime_json_parser,
+    datetime_json_parser,
+    deprecated_alias,
+    get_simbad_names,
+    json_serializer,
+)
 
 try:
     from .version import version as __version__
 except ImportError:
     __version__ = ""
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
 # pylint: disable=dangerous-default-value, too-many-arguments, trailing-whitespace, abstract-method
 
 # For SQLAlchemy ORM Declarative mapping
@@ -36,6 +61,68 @@ except ImportError:
 Base = declarative_base()
 
 
+def _load_json_file(filename):
+    """Read a single source JSON file, converting datetime strings. Used by the `Database.load_database` worker pool."""
+    if orjson is not None:
+        with open(filename, "rb") as f:
+            raw = f.read()
+        try:
+            return apply_datetime_json_parser(orjson.loads(raw))
+        except orjson.JSONDecodeError:
+            pass  # eg, NaN values written by the json module, which orjson does not accept
+
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f, object_hook=datetime_json_parser)
+
+
+def _write_json(data, filename):
+    """Write data as indented JSON. Used by the `Database.save_database` writer threads."""
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, indent=4, default=json_serializer))
+
+
+def _source_filename(source_name):
+    """JSON file name for a source, cleaning up spaces and other special characters"""
+    return source_name.lower().replace(" ", "_").replace("*", "").strip() + ".json"
+
+
+def _csv_table_data(filename, table):
+    """
+    Read the columns of a CSV file that are in the table into a DataFrame.
+    Files on disk are parsed with the multi-threaded pyarrow reader when it is installed;
+    text columns of the table are always read as strings so that values like dates or numbers are kept as is.
+    """
+    column_names = table.columns.keys()
+    if pa_csv is None or not isinstance(filename, (str, os.PathLike)):
+        return pd.read_csv(filename, usecols=lambda c: c in column_names)
+
+    column_types = {c.name: pa.string() for c in table.columns if isinstance(c.type, sqlalchemy_types.String)}
+    convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+    arrow_table = pa_csv.read_csv(filename, convert_options=convert_options)
+    return arrow_table.select([c for c in arrow_table.column_names if c in column_names]).to_pandas()
+
+
+def _astropy_table_data(data, table):
+    """Convert the columns of an astropy Table that are in the table into a DataFrame"""
+    column_names = table.columns.keys()
+    return data[[c for c in data.colnames if c in column_names]].to_pandas()
+
+
+def _pandas_table_data(data, table):
+    """Select the columns of a DataFrame that are in the table"""
+    column_names = table.columns.keys()
+    return data[[c for c in data.columns if c in column_names]]
+
+
+# Readers used by `Database.add_table_data`, by format name. Each takes the data and the SQLAlchemy Table
+# to insert into and returns a DataFrame with only the columns of that table.
+TABLE_DATA_LOADERS = {
+    "csv": _csv_table_data,
+    "astropy": _astropy_table_data,
+    "pandas": _pandas_table_data,
+}
+
+
 class AstrodbQuery(Query):
     """Subclassing the Query class to add more functionality.
     See: https://stackoverflow.com/questions/15936111/sqlalchemy-can-you-add-custom-methods-to-the-query-object
@@ -130,7 +217,7 @@ class AstrodbQuery(Query):
             return self.astropy(spectra=spectra, **kwargs)
 
 
-def load_connection(connection_string, sqlite_foreign=True, base=None, connection_arguments={}):
+def load_connection(connection_string, sqlite_foreign=True, base=None, connection_arguments={}, sqlite_pragmas={}):
     """Return session, base, and engine objects for connecting to the database.
 
     Parameters
@@ -145,6 +232,8 @@ def load_connection(connection_string, sqlite_foreign=True, base=None, connectio
         Use an existing base class. Default: None (ie, creates a new one)
     connection_arguments : dict
         Additional connection arguments, like {'check_same_thread': False}
+    sqlite_pragmas : dict
+        SQLite PRAGMA settings to apply to every new connection, like {'journal_mode': 'WAL', 'synchronous': 'OFF'}
 
     Returns
     -------
@@ -167,6 +256,8 @@ def load_connection(connection_string, sqlite_foreign=True, base=None, connectio
     # Enable foreign key checks in SQLite
     if "sqlite" in connection_string and sqlite_foreign:
         set_sqlite()
+    if "sqlite" in connection_string and sqlite_pragmas:
+        set_sqlite_pragmas(engine, sqlite_pragmas)
     # elif 'postgresql' in connection_string:
     #     # Set up schema in postgres (must be lower case?)
     #     from sqlalchemy import DDL
@@ -188,6 +279,21 @@ def set_sqlite():
         cursor.close()
 
 
+def set_sqlite_pragmas(engine, pragmas):
+    """
+    Apply SQLite PRAGMA settings to every new connection of the engine.
+    These are opt-in; eg, {'synchronous': 'OFF'} trades durability for speed and is only suited to scratch databases.
+    """
+    # pylint: disable=unused-argument
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
 def create_database(connection_string, drop_tables=False):
     """
     Create a database from a schema that utilizes the `astrodbkit2.astrodb.Base` class.
@@ -248,11 +354,11 @@ def copy_database_schema(
             dest_table.append_column(column._copy())  # pylint: disable=protected-access
         dest_table.create(bind=dest_engine)
 
-        # Copy data, row by row
+        # Copy data as a single executemany insert per table
         if copy_data:
             table_data = src_session.query(src_metadata.tables[table.name]).all()
-            for row in table_data:
-                dest_session.execute(dest_table.insert().values(row))
+            if len(table_data) > 0:
+                dest_session.execute(dest_table.insert(), [row._asdict() for row in table_data])
             dest_session.commit()
 
     # Explicitly close sessions/engines
@@ -275,6 +381,8 @@ class Database:
         column_type_overrides={},
         sqlite_foreign=True,
         connection_arguments={},
+        sqlite_pragmas={},
+        inventory_cache_size=0,
     ):
         """
         Wrapper for database calls and utility functions
@@ -300,13 +408,22 @@ class Database:
             Flag to enable/disable use of foreign keys with SQLite. Default: True
         connection_arguments : dict
             Additional connection arguments, like {'check_same_thread': False}. Default: {}
+        sqlite_pragmas : dict
+            SQLite PRAGMA settings applied to each connection, like {'journal_mode': 'WAL', 'cache_size': -65536}.
+            Not applied to in-memory databases created with 'sqlite://'. Default: {}
+        inventory_cache_size : int
+            Number of `Database.inventory` results to cache. Only use this when no other connection or process
+            writes to the database, as only changes made through this object are detected. Default: 0 (no cache)
         """
 
         if connection_string == "sqlite://":
             self.session, self.base, self.engine = create_database(connection_string)
         else:
             self.session, self.base, self.engine = load_connection(
-                connection_string, sqlite_foreign=sqlite_foreign, connection_arguments=connection_arguments
+                connection_string,
+                sqlite_foreign=sqlite_foreign,
+                connection_arguments=connection_arguments,
+                sqlite_pragmas=sqlite_pragmas,
             )
 
         # Convenience methods
@@ -341,7 +458,57 @@ class Database:
                 tab, col = k.split(".")
                 self.metadata.tables[tab].columns[col].type = v
 
+        # Cache the columns used to match each table against the primary table
+        self._primary_column = None
+        if self._primary_table in self.metadata.tables:
+            self._primary_column = self.metadata.tables[self._primary_table].columns[self._primary_table_key]
+        self._foreign_columns = {
+            name: t.columns[self._foreign_key]
+            for name, t in self.metadata.tables.items()
+            if self._foreign_key in t.columns
+        }
+
+        # Optional least recently used cache of inventory results by source name. It is cleared by any statement
+        # other than a SELECT run on this engine and again when the transaction with such statements is committed or
+        # rolled back. Nothing is stored while a transaction has uncommitted modifications, and the generation counter
+        # prevents storing results read before the cache was cleared.
+        # The uncommitted modifications are also tracked without a cache, for `Database.save_database`.
+        self._inventory_cache_size = inventory_cache_size
+        self._inventory_cache = OrderedDict()
+        self._inventory_lock = threading.Lock()
+        self._inventory_generation = 0
+        self._inventory_pending = 0
+        event.listen(self.engine, "after_cursor_execute", self._clear_inventory_cache_on_write)
+        event.listen(self.engine, "commit", self._clear_inventory_cache_on_end)
+        event.listen(self.engine, "rollback", self._clear_inventory_cache_on_end)
+
     # Generic methods
+    def _clear_inventory_cache(self):
+        """Clear the inventory cache"""
+        with self._inventory_lock:
+            self._inventory_generation += 1
+            self._inventory_cache.clear()
+
+    def _clear_inventory_cache_on_write(self, conn, cursor, statement, *args):
+        """Engine event listener to clear the inventory cache when a statement may modify the database"""
+        if statement.lstrip()[:6].upper() != "SELECT":
+            if not conn.info.get("astrodbkit_modified", False):
+                conn.info["astrodbkit_modified"] = True
+                self._inventory_pending += 1
+            self._clear_inventory_cache()
+
+    def _clear_inventory_cache_on_end(self, conn):
+        """Engine event listener to clear the inventory cache when modifications are committed or rolled back"""
+        if conn.info.pop("astrodbkit_modified", False):
+            self._inventory_pending -= 1
+            self._clear_inventory_cache()
+
+    def _match_column(self, table_name):
+        """Return the column of `table_name` that refers to the primary table key"""
+        if table_name == self._primary_table:
+            return self._primary_column
+        return self._foreign_columns[table_name]
+
     @staticmethod
     def _handle_format(temp, fmt):
         # Internal method to handle SQLAlchemy output and format it
@@ -352,7 +519,7 @@ class Database:
                 results = AstropyTable(temp)
         elif fmt.lower() == "pandas":
             if len(temp) > 0:
-                results = pd.DataFrame(temp, columns=temp[0]._fields)
+                results = pd.DataFrame.from_records(temp, columns=list(temp[0]._fields))
             else:
                 results = pd.DataFrame(temp)
         else:
@@ -369,7 +536,7 @@ class Database:
         Parameters
         ----------
         row :
-            SQLAlchemy row object
+            SQLAlchemy row mapping object
 
         Returns
         -------
@@ -377,11 +544,38 @@ class Database:
             Dictionary version of the row object
         """
 
-        row_dict = row._asdict()
+        row_dict = dict(row)
         del row_dict[self._foreign_key]
         return row_dict
 
-    def _inventory_query(self, data_dict, table_name, source_name):
+    def _inventory_data(self, name, conn):
+        """
+        Query all information for a source, without the cache. Used internally by `Database.inventory`
+        and `Database.save_database`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the source to search for
+        conn : SQLAlchemy connection or session
+            Connection to use for the queries
+
+        Returns
+        -------
+        data_dict : dict
+            Dictionary of all information for the given source.
+        """
+
+        data_dict = {}
+        # Loop over tables (not reference tables) and gather the information. Start with the primary table, though
+        self._inventory_query(data_dict, self._primary_table, name, conn)
+        for table in self.metadata.tables:
+            if table in self._reference_tables + [self._primary_table]:
+                continue
+            self._inventory_query(data_dict, table, name, conn)
+        return data_dict
+
+    def _inventory_query(self, data_dict, table_name, source_name, conn):
         """
         Handler method to query database contents for the specified source.
         Table results are stored as new keys in `data_dict`. Used internally by `Database.inventory`.
@@ -394,19 +588,18 @@ class Database:
             Table to query
         source_name : str
             Source to query on
+        conn : SQLAlchemy connection or session
+            Connection to use for the query
         """
 
         table = self.metadata.tables[table_name]
+        column = self._match_column(table_name)
 
-        if table_name == self._primary_table:
-            column = table.columns[self._primary_table_key]
-        else:
-            column = table.columns[self._foreign_key]
-
-        results = self.session.query(table).filter(column == source_name).all()
+        # Core select avoids the ORM overhead since results are converted to dictionaries anyway
+        results = conn.execute(select(table).where(column == source_name)).mappings().all()
 
         if results and table_name == self._primary_table:
-            data_dict[table_name] = [row._asdict() for row in results]
+            data_dict[table_name] = [dict(row) for row in results]
         elif results:
             data_dict[table_name] = [self._row_cleanup(row) for row in results]
 
@@ -414,6 +607,9 @@ class Database:
         """
         Method to return a dictionary of all information for a given source, matched by name.
         Each table is a key of this dictionary.
+        Queries run through `Database.session`, so changes flushed but not yet committed in it are included.
+        If the database was created with `inventory_cache_size`, results are cached until the database is modified
+        through this object's engine; changes made by other connections to the same database are not detected.
 
         Parameters
         ----------
@@ -428,13 +624,23 @@ class Database:
             Dictionary of all information for the given source.
         """
 
-        data_dict = {}
-        # Loop over tables (not reference tables) and gather the information. Start with the primary table, though
-        self._inventory_query(data_dict, self._primary_table, name)
-        for table in self.metadata.tables:
-            if table in self._reference_tables + [self._primary_table]:
-                continue
-            self._inventory_query(data_dict, table, name)
+        if self._inventory_cache_size <= 0:
+            data_dict = self._inventory_data(name, self.session)
+        else:
+            # Results are cached until the database is modified; copies are returned so the cache cannot be altered
+            with self._inventory_lock:
+                generation = self._inventory_generation
+                data_dict = self._inventory_cache.get(name)
+                if data_dict is not None:
+                    self._inventory_cache.move_to_end(name)
+            if data_dict is None:
+                data_dict = self._inventory_data(name, self.session)
+                with self._inventory_lock:
+                    if generation == self._inventory_generation and self._inventory_pending == 0:
+                        self._inventory_cache[name] = data_dict
+                        if len(self._inventory_cache) > self._inventory_cache_size:
+                            self._inventory_cache.popitem(last=False)
+            data_dict = copy.deepcopy(data_dict)
 
         if pretty_print:
             print(json.dumps(data_dict, indent=4, default=json_serializer))
@@ -468,7 +674,7 @@ class Database:
             Get additional names from Simbad. Default: False
         table_names : dict
             Dictionary of tables to search for name information. Should be of the form table name: column name list.
-            Default: {'Sources': ['source', 'shortname'], 'Names': 'other_name'}
+            Default: {'Sources': ['source', 'shortname'], 'Names': ['other_name']}
         fmt : str
             Format to return results in (pandas, astropy/table, default). Default is astropy table
         fuzzy_search : bool
@@ -487,10 +693,6 @@ class Database:
         if output_table not in self.metadata.tables:
             raise RuntimeError(f"Table {output_table} is not in the database")
 
-        match_column = self._foreign_key
-        if output_table == self._primary_table:
-            match_column = self._primary_table_key
-
         # Query Simbad to get additional names and join them to list to search
         if resolve_simbad:
             simbad_names = get_simbad_names(name, verbose=verbose)
@@ -510,29 +712,31 @@ class Database:
         # Get source for objects that match the provided names
         # The following will build the filters required to query all specified tables
         # approximately by case-insensitive names.
-        # This is not really optimized as it does separate DB calls,
-        # but is the simpler setup and at our scale is sufficient
-        matched_names = []
+        # Filters for all columns of a table are combined so that each table is only scanned once
+        # Exact searches compare the lower-cased names with a single IN clause per column instead of LIKE patterns.
+        # Both sides are lower-cased by the database so they are folded the same way (eg, ASCII only for SQLite)
+        lower_names = [func.lower(literal(n)) for n in name]
+        matches = []
         for k, col_list in table_names.items():
+            columns = self.metadata.tables[k].columns
+
+            filters = []
             for v in col_list:
+                column = columns[v]
                 if fuzzy_search:
-                    filters = [self.metadata.tables[k].columns[v].ilike(f"%{n}%") for n in name]
+                    filters += [column.ilike(f"%{n}%") for n in name]
                 else:
-                    filters = [self.metadata.tables[k].columns[v].ilike(f"{n}") for n in name]
+                    filters.append(func.lower(column).in_(lower_names))
 
-                # Column to be returned
-                if k == self._primary_table:
-                    output_to_match = self.metadata.tables[k].columns[self._primary_table_key]
-                else:
-                    output_to_match = self.metadata.tables[k].columns[self._foreign_key]
-
-                temp = self.query(output_to_match).filter(or_(*filters)).distinct().all()
-                matched_names += [s[0] for s in temp]
+            # Column to be returned
+            matches.append(select(self._match_column(k)).where(or_(*filters)))
 
         # Join the matched sources with the desired table
+        # The name matching runs as a subquery so the whole search is a single statement
+        matched_names = union(*matches) if len(matches) > 0 else []
         temp = (
             self.query(self.metadata.tables[output_table])
-            .filter(self.metadata.tables[output_table].columns[match_column].in_(matched_names))
+            .filter(self._match_column(output_table).in_(matched_names))
             .all()
         )
 
@@ -573,13 +777,17 @@ class Database:
                 or isinstance(c.type, sqlalchemy_types.Unicode)
             ]
 
+            # Tables without string columns cannot match
+            if len(col_list) == 0:
+                continue
+
             # Construct filters to query for each string column
             filters = []
             for c in col_list:
                 if fuzzy_search:
                     filters += [c.ilike(f"%{value}%")]
                 else:
-                    filters += [c.ilike(f"{value}")]
+                    filters += [func.lower(c) == func.lower(literal(value))]
 
             # Perform the actual query
             temp = self.query(self.metadata.tables[table]).filter(or_(*filters)).distinct().all()
@@ -596,9 +804,10 @@ class Database:
 
     # General query methods
     @deprecated_alias(format="fmt")
-    def sql_query(self, query, fmt="default"):
+    def sql_query(self, query, fmt="default", chunk_size=10000, dtype_backend=None):
         """
         Wrapper for a direct SQL query.
+        Results are streamed from the database in chunks rather than fetched all at once.
 
         Parameters
         ----------
@@ -606,14 +815,37 @@ class Database:
             Query to be performed
         fmt : str
             Format in which to return the results (pandas, astropy/table, default)
+        chunk_size : int
+            Number of rows to fetch from the database at a time. Default: 10000
+        dtype_backend : str
+            Backend for the column dtypes of pandas output ('numpy_nullable' or 'pyarrow'),
+            applied with `pandas.DataFrame.convert_dtypes`; requires pandas 2.0. Default: None (ie, NumPy dtypes)
 
         Returns
         -------
         List of SQLAlchemy results
         """
 
-        with self.engine.connect() as conn:
-            temp = conn.execute(text(query)).fetchall()
+        # dtype_backend was added to pandas in version 2.0
+        if dtype_backend is not None and int(pd.__version__.split(".")[0]) < 2:
+            raise RuntimeError(f"dtype_backend requires pandas 2.0 or later, found {pd.__version__}")
+
+        with self.engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as conn:
+            result = conn.execute(text(query))
+
+            # Build pandas output chunk by chunk so only one chunk of rows is held at a time
+            if fmt.lower() == "pandas":
+                columns = list(result.keys())
+                chunks = [pd.DataFrame.from_records(p, columns=columns) for p in result.partitions(chunk_size)]
+                if len(chunks) == 0:
+                    df = pd.DataFrame(columns=columns)
+                else:
+                    df = pd.concat(chunks, ignore_index=True)
+                if dtype_backend is not None:
+                    df = df.convert_dtypes(dtype_backend=dtype_backend)
+                return df
+
+            temp = [row for partition in result.partitions(chunk_size) for row in partition]
 
         return self._handle_format(temp, fmt)
 
@@ -669,11 +901,6 @@ class Database:
         if not isinstance(radius, Quantity):
             radius = Quantity(radius, unit="arcsec")
 
-        # Get the column name to use for matching
-        match_column = self._foreign_key
-        if output_table == self._primary_table:
-            match_column = self._primary_table_key
-
         # Grab the specified coordinate table (Sources by default) to construct SkyCoord objects
         if coordinate_table is None:
             coordinate_table = self._primary_table
@@ -683,26 +910,43 @@ class Database:
         if coordinate_table == self._primary_table:
             coordinate_match_column = self._primary_table_key
 
+        # Only the key and coordinate columns are needed for the separation calculation
+        columns = self.metadata.tables[coordinate_table].columns
+        dec_column = columns[dec_col]
+        query = self.query(columns[coordinate_match_column], columns[ra_col], dec_column)
+
+        # Restrict the rows to the declination band around the target in the database itself when the
+        # coordinates are stored as numbers in degrees; the exact separation is computed below for the remaining rows
+        units = unit if isinstance(unit, (tuple, list)) else (unit, unit)
+        if (
+            target_coords.isscalar
+            and all(u.Unit(x) == u.deg for x in units)
+            and isinstance(dec_column.type, (sqlalchemy_types.Numeric, sqlalchemy_types.Integer))
+        ):
+            target_dec = target_coords.transform_to(frame).spherical.lat.to_value(u.deg)
+            margin = radius.to_value(u.deg) + 1e-9  # small tolerance for rounding in the separation calculation
+            query = query.filter(dec_column.between(target_dec - margin, target_dec + margin))
+
         # This is adapted from the original astrodbkit code
-        df = self.query(self.metadata.tables[coordinate_table]).pandas()
-        df[["ra", "dec"]] = df[[ra_col, dec_col]].apply(pd.to_numeric)  # convert everything to floats
+        df = pd.DataFrame.from_records(query.all(), columns=["key", "ra_value", "dec_value"])
+        df[["ra", "dec"]] = df[["ra_value", "dec_value"]].apply(pd.to_numeric)  # convert everything to floats
         mask = df["ra"].isnull()
         df = df[~mask]
 
-        # Native use of astropy SkyCoord objects here
-        coord_list = SkyCoord(df["ra"].tolist(), df["dec"].tolist(), frame=frame, unit=unit)
+        # Native use of astropy SkyCoord objects here, built from the numpy arrays rather than Python lists
+        coord_list = SkyCoord(df["ra"].to_numpy(), df["dec"].to_numpy(), frame=frame, unit=unit)
         sep_list = coord_list.separation(target_coords)  # sky separations for each db object against target position
-        good = sep_list <= radius
+        good = np.asarray(sep_list <= radius)
 
-        if sum(good) > 0:
-            matched_list = df[coordinate_match_column][good]
+        if good.any():
+            matched_list = df["key"].to_numpy()[good].tolist()
         else:
             matched_list = []
 
         # Join the matched sources with the desired table
         temp = (
             self.query(self.metadata.tables[output_table])
-            .filter(self.metadata.tables[output_table].columns[match_column].in_(matched_list))
+            .filter(self._match_column(output_table).in_(matched_list))
             .all()
         )
         results = self._handle_format(temp, fmt)
@@ -725,17 +969,15 @@ class Database:
 
         # pylint: disable=unnecessary-dunder-call
 
+        # The inventory is read directly so that saved files never come from the cache
         if isinstance(name, str):
             source_name = str(name)
-            data = self.inventory(name)
+            data = self._inventory_data(name, self.session)
         else:
             source_name = str(name.__getattribute__(self._primary_table_key))
-            data = self.inventory(name.__getattribute__(self._primary_table_key))
+            data = self._inventory_data(name.__getattribute__(self._primary_table_key), self.session)
 
-        # Clean up spaces and other special characters
-        filename = source_name.lower().replace(" ", "_").replace("*", "").strip() + ".json"
-        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
-            f.write(json.dumps(data, indent=4, default=json_serializer))
+        _write_json(data, os.path.join(directory, _source_filename(source_name)))
 
     def save_reference_table(self, table: str, directory: str, reference_directory: str="reference"):
         """
@@ -759,8 +1001,7 @@ class Database:
         data = [row._asdict() for row in results]
         filename = table + ".json"
         if len(data) > 0:
-            with open(os.path.join(directory, reference_directory, filename), "w", encoding="utf-8") as f:
-                f.write(json.dumps(data, indent=4, default=json_serializer))
+            _write_json(data, os.path.join(directory, reference_directory, filename))
 
     def save_database(self, directory: str, clear_first: bool=True, reference_directory: str="reference", source_directory: str="source"):
         """
@@ -783,13 +1024,14 @@ class Database:
         # Clear existing files first from that directory
         if clear_first:
             print("Clearing existing JSON files...")
-            for file in os.listdir(directory):
-                file_path = os.path.join(directory, file)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                elif os.path.isdir(file_path):
+            with os.scandir(directory) as scanned:
+                entries = list(scanned)
+            with ThreadPoolExecutor(16) as executor:
+                list(executor.map(os.unlink, [e.path for e in entries if e.is_file()]))
+            for entry in entries:
+                if entry.is_dir():
                     # This is to handle the reference and source directories
-                    shutil.rmtree(file_path)
+                    shutil.rmtree(entry.path)
         
         # Create sub-directories if not already present
         if not os.path.isdir(os.path.join(directory, reference_directory)):
@@ -808,11 +1050,40 @@ class Database:
 
         # Output primary objects
         print(f"Storing individual sources to {os.path.join(directory, source_directory)}...")
-        for row in tqdm(self.query(self.metadata.tables[self._primary_table])):
-            self.save_json(row, os.path.join(directory, source_directory))
+        # Every source is read once, so the inventory cache is bypassed rather than filled with the whole database
+        source_names = [str(row[0]) for row in self.query(self._primary_column)]
+        with ThreadPoolExecutor(8) as executor:  # stays within the default connection pool size (5 + 10 overflow)
+            if isinstance(self.engine.pool, SingletonThreadPool) or self._inventory_pending > 0:
+                # In-memory SQLite databases have one connection per thread, and changes not yet committed are only
+                # visible to the connection that made them, so inventories are queried here in the session
+                # while the files are serialized and written by the pool of threads
+                futures = []
+                for source_name in tqdm(source_names):
+                    filename = os.path.join(directory, source_directory, _source_filename(source_name))
+                    data = self._source_data(source_name, self.session)
+                    futures.append(executor.submit(_write_json, data, filename))
+                for future in futures:
+                    future.result()  # raise any errors from writing the files
+            else:
+                # Otherwise the inventory queries also run concurrently, each thread using its own pooled connection
+                save_source = functools.partial(self._save_source, directory=os.path.join(directory, source_directory))
+                list(tqdm(executor.map(save_source, source_names), total=len(source_names)))
+
+    def _save_source(self, source_name, directory):
+        """Write the JSON file of a source on a new connection. Used by the `Database.save_database` threads."""
+        with self.engine.connect() as conn:
+            data = self._source_data(source_name, conn)
+        _write_json(data, os.path.join(directory, _source_filename(source_name)))
+
+    def _source_data(self, source_name, conn):
+        """Inventory of a source to save, which must at least include its row of the primary table"""
+        data = self._inventory_data(source_name, conn)
+        if self._primary_table not in data:
+            raise RuntimeError(f"Source {source_name} not found in {self._primary_table} while saving the database")
+        return data
 
     # Object input methods
-    def add_table_data(self, data, table, fmt="csv"):
+    def add_table_data(self, data, table, fmt="csv", chunk_size=10000):
         """
         Method to insert data into the database. Column names in the file must match those of the database table.
         Additional columns in the supplied table are ignored.
@@ -822,6 +1093,7 @@ class Database:
          - astropy
          - pandas
 
+        Other formats can be supported by adding a loader to `TABLE_DATA_LOADERS`.
 
         Parameters
         ----------
@@ -831,22 +1103,20 @@ class Database:
             Name of table to insert records into
         fmt : str
             Data format. Default: csv
+        chunk_size : int
+            Number of rows inserted per batch. Default: 10000
         """
 
-        if fmt.lower() == "csv":
-            df = pd.read_csv(data)
-        elif fmt.lower() == "astropy":
-            df = data.to_pandas()
-        elif fmt.lower() == "pandas":
-            df = data.copy()
-        else:
+        loader = TABLE_DATA_LOADERS.get(fmt.lower())
+        if loader is None:
             raise RuntimeError(f"Unrecognized format {fmt}")
+        df = loader(data, self.metadata.tables[table])
 
         # Foreign key constraints will prevent inserts of missing sources,
         # but for clarity we'll check first and exit if there are missing sources
         if table != self._primary_table:
             source_list = df[self._foreign_key].to_list()
-            primary_column = self.metadata.tables[self._primary_table].columns[self._primary_table_key]
+            primary_column = self._primary_column
             matched_sources = self.query(primary_column).filter(primary_column.in_(source_list)).all()
             missing_sources = np.setdiff1d(source_list, matched_sources)
             if len(missing_sources) > 0:
@@ -854,16 +1124,11 @@ class Database:
                 print(missing_sources)
                 raise RuntimeError(f"There are missing entries in {self._primary_table} table. These must exist first.")
 
-        # Convert format for SQLAlchemy
-        data = [row.to_dict() for _, row in df.iterrows()]
-
-        # Remove unused columns
-        column_names = self.metadata.tables[table].columns.keys()
-        fixed_data = [{k: v for k, v in d.items() if k in (d.keys() & column_names)} for d in data]
-
-        # Load into specified table
+        # Load into specified table as executemany batches, converting to records one chunk at a time
         with self.engine.begin() as conn:
-            conn.execute(self.metadata.tables[table].insert().values(fixed_data))
+            for start in range(0, len(df), chunk_size):
+                records = df.iloc[start : start + chunk_size].to_dict(orient="records")
+                conn.execute(self.metadata.tables[table].insert(), records)
 
     def load_table(self, table, directory, verbose=False):
         """
@@ -883,8 +1148,9 @@ class Database:
         if os.path.exists(filename):
             with open(filename, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                with self.engine.begin() as conn:
-                    conn.execute(self.metadata.tables[table].insert().values(data))
+                if len(data) > 0:  # an empty parameter list would insert a single row of defaults
+                    with self.engine.begin() as conn:
+                        conn.execute(self.metadata.tables[table].insert(), data)
         else:
             if verbose:
                 print(f"{table}.json not found.")
@@ -899,25 +1165,65 @@ class Database:
             Name of directory containing the JSON file
         """
 
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f, object_hook=datetime_json_parser)
+        rows = defaultdict(list)
+        self._collect_json_rows(_load_json_file(filename), rows)
+        with self.engine.begin() as conn:
+            self._insert_rows(conn, rows)
+
+    def _collect_json_rows(self, data, rows):
+        """
+        Handler method to gather the rows of a single source JSON into per-table lists,
+        adding the foreign key to all non-primary tables. Used internally by `Database.load_json`.
+
+        Parameters
+        ----------
+        data : dict
+            Dictionary of source data, as produced by `Database.inventory`
+        rows : dict
+            Dictionary of table name: list of rows to update.
+        """
 
-        # Loop through the dictionary, adding data to the database.
-        # Ensure that Sources is added first
         source = data[self._primary_table][0][self._primary_table_key]
-        with self.engine.begin() as conn:
-            conn.execute(self.metadata.tables[self._primary_table].insert().values(data[self._primary_table]))
-            for key, value in data.items():
-                if key == self._primary_table:
-                    continue
+        for key, value in data.items():
+            if key == self._primary_table:
+                rows[key].extend(value)
+            else:
+                # Multiple values (eg, Photometry) all refer back to the same source
+                rows[key].extend([{**v, self._foreign_key: source} for v in value])
 
-                # Loop over multiple values (eg, Photometry)
-                for v in value:
-                    temp_dict = v
-                    temp_dict[self._foreign_key] = source
-                    conn.execute(self.metadata.tables[key].insert().values(temp_dict))
+    def _insert_rows(self, conn, rows):
+        """
+        Handler method to insert per-table lists of rows with one executemany per table.
+        Tables are processed in dependency order so that the primary table is added first.
 
-    def load_database(self, directory: str, verbose: bool=False, reference_directory: str="reference", source_directory: str="source"):
+        Parameters
+        ----------
+        conn : SQLAlchemy connection
+            Connection (with an open transaction) to use for the inserts
+        rows : dict
+            Dictionary of table name: list of rows to insert.
+        """
+
+        for table in self.metadata.sorted_tables:
+            if not rows.get(table.name):
+                continue
+
+            # executemany requires every parameter set to have the same keys
+            groups = defaultdict(list)
+            for row in rows[table.name]:
+                groups[frozenset(row)].append(row)
+            for group in groups.values():
+                conn.execute(table.insert(), group)
+
+    def load_database(
+        self,
+        directory: str,
+        verbose: bool = False,
+        reference_directory: str = "reference",
+        source_directory: str = "source",
+        batch_size: int = 1000,
+        processes: int = None,
+    ):
         """
         Reload entire database from a directory of JSON files.
         Note that this will first clear existing tables.
@@ -932,6 +1238,12 @@ class Database:
             Relative path to sub-directory to use for reference JSON files (eg, data/reference)
         source_directory : str
             Relative path to sub-directory to use for source JSON files (eg, data/source)
+        batch_size : int
+            Number of buffered rows at which source data is inserted. Default: 1000
+        processes : int
+            Number of worker processes used to parse the source JSON files.
+            Scripts using this need an ``if __name__ == "__main__":`` guard on platforms that spawn processes
+            (macOS, Windows). Default: None (ie, files are parsed in this process)
         """
 
         # Clear existing database contents
@@ -963,7 +1275,8 @@ class Database:
             directory_of_sources = directory
 
         # Scan selected directory for JSON source files
-        for file in tqdm(os.listdir(directory_of_sources)):
+        files = []
+        for file in os.listdir(directory_of_sources):
             # Skip reference tables
             core_name = file.replace(".json", "")
             if core_name in self._reference_tables:
@@ -973,7 +1286,24 @@ class Database:
             if not file.endswith(".json") or file.startswith("."):
                 continue
 
-            self.load_json(os.path.join(directory_of_sources, file))
+            files.append(os.path.join(directory_of_sources, file))
+
+        # Parse the JSON files, optionally in worker processes, and gather the rows for each table
+        # Rows are inserted in batches as they accumulate, all within a single transaction
+        rows = defaultdict(list)
+        executor = ProcessPoolExecutor(processes) if processes is not None else contextlib.nullcontext()
+        with executor, self.engine.begin() as conn:
+            if processes is not None:
+                parsed = executor.map(_load_json_file, files, chunksize=32)
+            else:
+                parsed = map(_load_json_file, files)
+            for data in tqdm(parsed, total=len(files)):
+                self._collect_json_rows(data, rows)
+                if sum(len(table_rows) for table_rows in rows.values()) >= batch_size:
+                    self._insert_rows(conn, rows)
+                    rows.clear()
+
+            self._insert_rows(conn, rows)
 
     def dump_sqlite(self, database_name):
         """Output database as a sqlite file"""
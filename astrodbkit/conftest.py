@@ -0,0 +1,13 @@
+# Shared fixtures for the astrodbkit tests
+
+import pytest
+
+from astrodbkit.utils import _query_simbad_ids
+
+
+@pytest.fixture(autouse=True)
+def clear_simbad_cache():
+    # Simbad results are cached by name, so clear them to keep mocked queries independent between tests
+    _query_simbad_ids.cache_clear()
+    yield
+    _query_simbad_ids.cache_clear()
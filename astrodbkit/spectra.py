@@ -1,6 +1,9 @@
 """Functions to handle loading of spectrum objects"""
 
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 
 import astropy.units as u
 import numpy as np
@@ -12,65 +15,130 @@ from specutils import Spectrum1D
 from specutils.io.parsing_utils import read_fileobj_or_hdulist
 from specutils.io.registers import data_loader
 
+try:
+    import fitsio
+except ImportError:
+    fitsio = None
+
 # pylint: disable=no-member, unused-argument
 
+# Options for fits.open: only the HDUs that are used are read. Memory mapping is left to astropy,
+# which uses it unless the data has to be scaled (BSCALE/BZERO/BLANK) when it is read.
+# Header-only opens skip the scaling and map the data, which is never read.
+_FITS_OPEN_KWARGS = {"lazy_load_hdus": True}
+_FITS_HEADER_KWARGS = {**_FITS_OPEN_KWARGS, "memmap": True, "do_not_scale_image_data": True}
+
+# Keywords that couple or rotate the spectral axis, which require the full WCS to be computed
+_WCS_MATRIX_KEY = re.compile(r"^(?:PC|CD)\d|^CROTA")
+
+# Environment variable references left in a path after expansion
+_ENVVAR = re.compile(r"\$\{?\w+\}?")
+
+# Names of all units defined in astropy.units, used to validate units parsed from IRAF headers
+_ASTROPY_UNITS = frozenset(name for name in dir(u) if isinstance(getattr(u, name, None), u.UnitBase))
+
+
+def _is_local_file(filename):
+    """Check whether the given argument is a path to a file on disk"""
+    return isinstance(filename, str) and os.path.isfile(filename)
+
+
+@lru_cache(maxsize=256)
+def _cached_header(filename, ext, mtime, size):
+    """
+    Read the header of a local FITS file as a dictionary.
+    Modification time and size are part of the cache key so that changed files are read again.
+    """
+    if fitsio is not None:
+        return dict(fitsio.read_header(filename, ext=ext))
+    return dict(fits.getheader(filename, ext=ext))
+
+
+def _read_header(filename, ext=0):
+    """
+    Read a single FITS header for the identifier functions.
+    Local files are read with fitsio, if installed, which is much faster than astropy for header-only access,
+    and cached since the registry may call several identifiers on the same file.
+    """
+    if _is_local_file(filename):
+        stat = os.stat(filename)
+        return _cached_header(filename, ext, stat.st_mtime, stat.st_size)
+
+    with fits.open(filename, **_FITS_HEADER_KWARGS) as hdulist:
+        return hdulist[ext].header
+
 
 def _identify_spex(filename):
     """
     Check whether the given file is a SpeX data product.
     """
     try:
-        with fits.open(filename, memmap=False) as hdulist:
-            return "spex" in hdulist[0].header["INSTRUME"].lower() and "irtf" in hdulist[0].header["TELESCOP"].lower()
+        header = _read_header(filename)
+        return _is_spex_header(header)
     except Exception:  # pylint: disable=broad-except,
         return False
 
 
+def _is_spex_header(header):
+    """Check the INSTRUME and TELESCOP keywords of a header for SpeX at the IRTF"""
+    return "spex" in header["INSTRUME"].lower() and "irtf" in header["TELESCOP"].lower()
+
+
 def identify_spex_prism(origin, *args, **kwargs):
     """
     Confirm this is a SpeX Prism FITS file.
     See FITS keyword reference at http://irtfweb.ifa.hawaii.edu/~spex/observer/
     Notes: GRAT has values of: ShortXD, Prism, LXD_long, LXD_short, SO_long, SO_short
     """
-    is_spex = _identify_spex(args[0])
-    if is_spex:
-        with fits.open(args[0], memmap=False) as hdulist:
-            return (
-                isinstance(args[0], str)
-                and os.path.splitext(args[0].lower())[1] == ".fits"
-                and is_spex
-                and ("lowres" in hdulist[0].header["GRAT"].lower() or "prism" in hdulist[0].header["GRAT"].lower())
-            )
-    else:
-        return is_spex
+    # Check the file name before reading anything, then read the header only once
+    if not (isinstance(args[0], str) and os.path.splitext(args[0].lower())[1] == ".fits"):
+        return False
+
+    try:
+        header = _read_header(args[0])
+        grat = header["GRAT"].lower()
+        return _is_spex_header(header) and ("lowres" in grat or "prism" in grat)
+    except Exception:  # pylint: disable=broad-except,
+        return False
 
 
 @data_loader("Spex Prism", identifier=identify_spex_prism, extensions=["fits"], dtype=Spectrum1D)
 def spex_prism_loader(filename, **kwargs):
     """Open a SpeX Prism file and convert it to a Spectrum1D object"""
 
-    with fits.open(filename, **kwargs) as hdulist:
-        header = hdulist[0].header
-
-        tab = hdulist[0].data
-
-        # Handle missing/incorrect units
-        try:
-            flux_unit = header["YUNITS"].replace("ergs", "erg ").strip()
-            wave_unit = header["XUNITS"].replace("Microns", "um")
-        except (KeyError, ValueError):
-            # For now, assume some default units
-            flux_unit = "erg"
-            wave_unit = "um"
+    tab = None
+    if fitsio is not None and _is_local_file(filename) and not kwargs:
+        # Only read the rows that are used; fitsio applies BSCALE/BZERO but not BLANK,
+        # so images with BLANK values are left to astropy. The header is read by astropy,
+        # which keeps long string values continued over several cards.
+        header = fits.getheader(filename)
+        if "BLANK" not in header:
+            with fitsio.FITS(filename) as f:
+                n_rows = f[0].get_info()["dims"][0]
+                tab = [f[0][i : i + 1, :].ravel() for i in range(min(n_rows, 3))]
+    if tab is None:
+        with fits.open(filename, **{**_FITS_OPEN_KWARGS, **kwargs}) as hdulist:
+            header = hdulist[0].header
+            n_rows = hdulist[0].data.shape[0]
+            tab = [hdulist[0].data[i] for i in range(min(n_rows, 3))]
+
+    # Handle missing/incorrect units
+    try:
+        flux_unit = header["YUNITS"].replace("ergs", "erg ").strip()
+        wave_unit = header["XUNITS"].replace("Microns", "um")
+    except (KeyError, ValueError):
+        # For now, assume some default units
+        flux_unit = "erg"
+        wave_unit = "um"
 
-        wave, data = tab[0] * Unit(wave_unit), tab[1] * Unit(flux_unit)
+    wave, data = tab[0] * Unit(wave_unit), tab[1] * Unit(flux_unit)
 
-        if tab.shape[0] == 3:
-            uncertainty = StdDevUncertainty(tab[2])
-        else:
-            uncertainty = None
+    if n_rows == 3:
+        uncertainty = StdDevUncertainty(tab[2])
+    else:
+        uncertainty = None
 
-        meta = {"header": header}
+    meta = {"header": header}
 
     return Spectrum1D(flux=data, spectral_axis=wave, uncertainty=uncertainty, meta=meta)
 
@@ -81,15 +149,101 @@ def identify_wcs1d_multispec(origin, *args, **kwargs):
     """
     hdu = kwargs.get("hdu", 0)
 
+    if _is_local_file(args[0]):
+        try:
+            header = _read_header(args[0], ext=hdu)
+        except OSError:
+            return False
+    else:
+        with read_fileobj_or_hdulist(*args, **kwargs) as hdulist:
+            header = hdulist[hdu].header
+
     # Check if number of axes is one and dimension of WCS is greater than one
-    with read_fileobj_or_hdulist(*args, **kwargs) as hdulist:
-        return (
-            hdulist[hdu].header.get("WCSDIM", 1) > 1
-            and hdulist[hdu].header["NAXIS"] > 1
-            and "WAT0_001" in hdulist[hdu].header
-            and hdulist[hdu].header.get("WCSDIM", 1) == hdulist[hdu].header["NAXIS"]
-            and "LINEAR" in hdulist[hdu].header.get("CTYPE1", "")
-        )
+    return (
+        header.get("WCSDIM", 1) > 1
+        and header["NAXIS"] > 1
+        and "WAT0_001" in header
+        and header.get("WCSDIM", 1) == header["NAXIS"]
+        and "LINEAR" in header.get("CTYPE1", "")
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_wat1(wat1):
+    """Parse an IRAF-style WAT1_001 card (eg, 'wtype=linear label=Wavelength units=angstroms') into a dictionary"""
+    return dict(rec.split("=", 1) for rec in wat1.split())
+
+
+@lru_cache(maxsize=256)
+def _unit(unit):
+    """Parse a unit string once; the same BUNIT values are repeated across many files"""
+    return u.Unit(unit)
+
+
+def _flux_quantity(data, header, flux_unit=None):
+    """
+    Convert a data array to a Quantity using the BUNIT keyword of the header, if present.
+    Values are converted to flux_unit when it is provided, scaling the single copy of the data in place.
+    """
+    if "BUNIT" not in header:
+        return u.Quantity(data, unit=flux_unit)
+
+    unit = _unit(header["BUNIT"])
+    if u.A in unit.bases:
+        unit = unit * u.A / u.AA  # convert ampere to Angroms
+    data = u.Quantity(data, unit=unit)
+    if flux_unit is not None:
+        flux_unit = _unit(flux_unit)
+        factor = unit.to(flux_unit)
+        if factor != 1.0:
+            np.multiply(data.value, factor, out=data.value)
+        data = u.Quantity(data.value, unit=flux_unit, copy=False)
+    return data
+
+
+def _spectral_unit_from_wat1(header, verbose=False):
+    """Spectral axis unit for headers without CUNIT1: extracted from the IRAF-style card or Angstrom as default"""
+    if "WAT1_001" not in header:
+        return "Angstrom"
+
+    unit = _parse_wat1(header["WAT1_001"]).get("units", "Angstrom")
+    if verbose:
+        print(f"Extracted spectral axis unit '{unit}' from 'WAT1_001'")
+    if unit not in _ASTROPY_UNITS:  # try with unit name stripped of excess plural 's'...
+        unit = unit.rstrip("s")
+    return unit
+
+
+def _linear_spectral_axis(header, verbose=False):
+    """
+    Compute a LINEAR spectral axis directly from the CRVAL1/CDELT1/CRPIX1 keywords, without building a WCS object.
+    Missing keywords take the same defaults as in wcslib.
+    Returns None if the header needs the full WCS (non-LINEAR axis, PC/CD matrix or rotation, unknown unit).
+    """
+    if "LINEAR" not in header.get("CTYPE1", "") or any(_WCS_MATRIX_KEY.match(key) for key in header):
+        return None
+
+    unit = header.get("CUNIT1", "").strip() or _spectral_unit_from_wat1(header, verbose=verbose)
+    try:
+        unit = _unit(unit)
+    except ValueError:
+        return None
+
+    pixels = np.arange(header["NAXIS1"])
+    crval, cdelt, crpix = header.get("CRVAL1", 0.0), header.get("CDELT1", 1.0), header.get("CRPIX1", 0.0)
+    return u.Quantity(crval + cdelt * (pixels + 1 - crpix), unit=unit, copy=False)
+
+
+def _wcs_spectral_axis(header, verbose=False):
+    """Compute the spectral axis from the full WCS of the header"""
+    wcs = WCS(header)
+    if wcs.wcs.cunit[0] == "":
+        wcs.wcs.cunit[0] = _spectral_unit_from_wat1(header, verbose=verbose)
+
+    # wcs_pix2world skips the distortion lookups of all_pix2world, which do not apply to LINEAR spectral axes
+    pixels = np.zeros((wcs.pixel_shape[0], wcs.naxis))
+    pixels[:, 0] = np.arange(wcs.pixel_shape[0])
+    return u.Quantity(wcs.wcs_pix2world(pixels, 0)[:, 0], unit=wcs.wcs.cunit[0], copy=False)
 
 
 @data_loader("wcs1d-multispec", identifier=identify_wcs1d_multispec, extensions=["fits"], dtype=Spectrum1D, priority=10)
@@ -118,62 +272,46 @@ def wcs1d_multispec_loader(file_obj, flux_unit=None, hdu=0, verbose=False, **kwa
     :class:`~specutils.Spectrum1D`
     """
 
-    with read_fileobj_or_hdulist(file_obj, **kwargs) as hdulist:
+    with read_fileobj_or_hdulist(file_obj, **{**_FITS_OPEN_KWARGS, **kwargs}) as hdulist:
         header = hdulist[hdu].header
-        wcs = WCS(header)
-
-        # Load data, convert units if BUNIT and flux_unit is provided and not the same
-        if "BUNIT" in header:
-            data = u.Quantity(hdulist[hdu].data, unit=header["BUNIT"])
-            if u.A in data.unit.bases:
-                data = data * u.A / u.AA  # convert ampere to Angroms
-            if flux_unit is not None:
-                data = data.to(flux_unit)
+        data = hdulist[hdu].data
+
+        # Identify the correct parts of the data to store
+        # This is done before any unit conversion so that unused planes are never read or copied
+        if len(data.shape) > 1:
+            flux_data = data[0]
         else:
-            data = u.Quantity(hdulist[hdu].data, unit=flux_unit)
-
-    if wcs.wcs.cunit[0] == "" and "WAT1_001" in header:
-        # Try to extract from IRAF-style card or use Angstrom as default.
-        wat_dict = dict((rec.split("=") for rec in header["WAT1_001"].split()))
-        unit = wat_dict.get("units", "Angstrom")
-        if hasattr(u, unit):
-            wcs.wcs.cunit[0] = unit
-        else:  # try with unit name stripped of excess plural 's'...
-            wcs.wcs.cunit[0] = unit.rstrip("s")
-        if verbose:
-            print(f"Extracted spectral axis unit '{unit}' from 'WAT1_001'")
-    elif wcs.wcs.cunit[0] == "":
-        wcs.wcs.cunit[0] = "Angstrom"
-
-    # Compatibility attribute for lookup_table (gwcs) WCS
-    wcs.unit = tuple(wcs.wcs.cunit)
-
-    # Identify the correct parts of the data to store
-    if len(data.shape) > 1:
-        flux_data = data[0]
-    else:
-        flux_data = data
-    uncertainty = None
-    if "NAXIS3" in header:
-        for i in range(header["NAXIS3"]):
-            if "spectrum" in header.get(f"BANDID{i+1}", ""):
-                flux_data = data[i]
-            if "sigma" in header.get(f"BANDID{i+1}", ""):
-                uncertainty = data[i]
-
-    # Reshape arrays if needed
+            flux_data = data
+        uncertainty = None
+        if "NAXIS3" in header:
+            # Collect the band descriptions in a single pass over the header
+            bandids = {
+                int(key[6:]): value for key, value in header.items() if key.startswith("BANDID") and key[6:].isdigit()
+            }
+            for band in sorted(band for band in bandids if 1 <= band <= header["NAXIS3"]):
+                if "spectrum" in bandids[band]:
+                    flux_data = data[band - 1]
+                if "sigma" in bandids[band]:
+                    uncertainty = data[band - 1]
+
+        flux_data = _flux_quantity(flux_data, header, flux_unit)
+        if uncertainty is not None:
+            uncertainty = _flux_quantity(uncertainty, header, flux_unit)
+
+    # Reshape arrays if needed, ravel returns a view unless the data is not contiguous
     if len(flux_data) == 1 and len(flux_data.shape) > 1:
-        flux_data = np.reshape(flux_data, -1)
+        flux_data = flux_data.ravel()
         if uncertainty is not None:
-            uncertainty = np.reshape(uncertainty, -1)
+            uncertainty = uncertainty.ravel()
 
     # Convert uncertainty to StdDevUncertainty array
     if uncertainty is not None:
         uncertainty = StdDevUncertainty(uncertainty)
 
     # Manually generate spectral axis
-    pixels = [[i] + [0] * (wcs.naxis - 1) for i in range(wcs.pixel_shape[0])]
-    spectral_axis = [i[0] for i in wcs.all_pix2world(pixels, 0)] * wcs.wcs.cunit[0]
+    spectral_axis = _linear_spectral_axis(header, verbose=verbose)
+    if spectral_axis is None:
+        spectral_axis = _wcs_spectral_axis(header, verbose=verbose)
 
     # Store header as metadata information
     meta = {"header": header}
@@ -196,15 +334,11 @@ def load_spectrum(filename: str, spectra_format: str = None, raise_error: bool =
     """
 
     # Convert filename if using environment variables
-    if filename.startswith("$"):
-        partial_path, _ = os.path.split(filename)
-        while partial_path != "":
-            partial_path, envvar_name = os.path.split(partial_path)
-        abs_path = os.getenv(envvar_name[1:])
-        if abs_path is not None:
-            filename = filename.replace(envvar_name, abs_path)
-        else:
-            print(f"Could not find environment variable {envvar_name}")
+    if "$" in filename:
+        filename = os.path.expandvars(filename)
+        missing = _ENVVAR.search(filename)
+        if missing is not None:
+            print(f"Could not find environment variable {missing.group()}")
 
     try:
         if spectra_format is not None:
@@ -222,3 +356,68 @@ def load_spectrum(filename: str, spectra_format: str = None, raise_error: bool =
             spec1d = filename
 
     return spec1d
+
+
+def _load_spectrum_data(filename, spectra_format=None):
+    """
+    Load a spectrum in a worker process of load_spectra. Spectrum1D objects cannot be pickled back to the parent
+    process because of their WCS, so only the arrays they are built from are returned.
+    """
+    spec1d = load_spectrum(filename, spectra_format=spectra_format)
+    if not isinstance(spec1d, Spectrum1D):
+        return spec1d
+
+    uncertainty = spec1d.uncertainty
+    if uncertainty is not None:
+        uncertainty = (type(uncertainty), uncertainty.array, uncertainty.unit)
+    return {
+        "flux": spec1d.flux,
+        "spectral_axis": u.Quantity(spec1d.spectral_axis),
+        "uncertainty": uncertainty,
+        "mask": spec1d.mask,
+        "meta": spec1d.meta,
+    }
+
+
+def _spectrum_from_data(data):
+    """Rebuild a Spectrum1D from the output of _load_spectrum_data"""
+    if not isinstance(data, dict):
+        return data
+
+    uncertainty = data.pop("uncertainty")
+    if uncertainty is not None:
+        uncertainty_type, array, unit = uncertainty
+        uncertainty = uncertainty_type(array, unit=unit)
+    return Spectrum1D(uncertainty=uncertainty, **data)
+
+
+def load_spectra(filenames, spectra_format: str = None, max_workers: int = None, use_processes: bool = False):
+    """Load several spectra concurrently with load_spectrum
+
+    Reading spectra is mostly bound by file access, which releases the GIL, so a thread pool is used by default.
+
+    Parameters
+    ----------
+    filenames
+        List of file names to read
+    spectra_format
+        Optional file format, passed to Spectrum1D.read.
+        In its absense Spectrum1D.read will attempt to determine the format.
+    max_workers
+        Maximum number of workers. Default: None uses the executor's default.
+    use_processes
+        Use a pool of processes instead of threads, for CPU-bound loaders. Default: False
+
+    Returns
+    -------
+    spectra : list
+        Spectrum1D objects, or the file name for those that could not be read, in the same order as filenames
+    """
+
+    if use_processes:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(partial(_load_spectrum_data, spectra_format=spectra_format), filenames)
+            return [_spectrum_from_data(data) for data in results]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(partial(load_spectrum, spectra_format=spectra_format), filenames))
@@ -4,6 +4,8 @@ import io
 import json
 import os
 import shutil
+import subprocess
+import sys
 
 import pandas as pd
 import pytest
@@ -14,6 +16,7 @@ from astropy.table import Table
 from astropy.units.quantity import Quantity
 from sqlalchemy.exc import IntegrityError
 
+from astrodbkit import astrodb
 from astrodbkit.astrodb import Database, copy_database_schema, create_database
 from astrodbkit.schema_example import *
 from astrodbkit.views import view
@@ -33,6 +36,17 @@ def test_nodatabase():
         _ = Database(connection_string)
 
 
+def test_sqlite_pragmas(tmp_path):
+    connection_string = 'sqlite:///' + os.path.join(tmp_path, 'pragmas.db')
+    create_database(connection_string)
+    db = Database(connection_string, sqlite_pragmas={'journal_mode': 'WAL', 'synchronous': 'OFF'})
+    with db.engine.connect() as conn:
+        assert conn.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+        assert conn.exec_driver_sql('PRAGMA synchronous').scalar() == 0
+    db.session.close()
+    db.engine.dispose()
+
+
 @pytest.fixture(scope="module")
 def db_dir(tmpdir_factory):
     return tmpdir_factory.mktemp("data")
@@ -40,19 +54,19 @@ def db_dir(tmpdir_factory):
 
 @pytest.fixture(scope="module")
 def db():
-    # Create a fresh temporary database and assert it exists
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
-    connection_string = 'sqlite:///' + DB_PATH
-    create_database(connection_string)
-    assert os.path.exists(DB_PATH)
+    # Create a fresh shared in-memory database; nothing needs to be written to disk until it is dumped
+    # The creating engine is kept open as the database only exists while it has a connection
+    connection_string = 'sqlite:///file:astrodbkit_test?mode=memory&cache=shared&uri=true'
+    _, _, creation_engine = create_database(connection_string)
 
     # Connect to the new database and confirm it has the Sources table
     db = Database(connection_string)
     assert db
     assert 'source' in [c.name for c in db.Sources.columns]
 
-    return db
+    yield db
+
+    creation_engine.dispose()
 
 
 def test_add_data(db):
@@ -101,30 +115,29 @@ def test_add_data(db):
                  }]
 
     with db.engine.begin() as conn:
-        conn.execute(db.Publications.insert().values(publications_data))
-        conn.execute(db.Telescopes.insert().values([{'name': 'WISE'}]))
-        conn.execute(db.Sources.insert().values(sources_data))
-        conn.execute(db.Names.insert().values(names_data))
-        conn.execute(db.Photometry.insert().values(phot_data))
+        conn.execute(db.Publications.insert(), publications_data)
+        conn.execute(db.Telescopes.insert(), [{'name': 'WISE'}])
+        conn.execute(db.Sources.insert(), sources_data)
+        conn.execute(db.Names.insert(), names_data)
+        conn.execute(db.Photometry.insert(), phot_data)
 
     # Add SpectralType
     
     # First try with an incorrect regime value
     with pytest.raises(IntegrityError):
         with db.engine.begin() as conn:
-            conn.execute(db.SpectralTypes.insert().values(spt_data))
+            conn.execute(db.SpectralTypes.insert(), spt_data)
 
     # Then with an accpeted regime value
     spt_data[0]['regime'] = 'infrared'
     with db.engine.begin() as conn:
-        conn.execute(db.SpectralTypes.insert().values(spt_data))
+        conn.execute(db.SpectralTypes.insert(), spt_data)
 
     # Adding source with no ra/dec to test cone search
     sources_data = [{'source': 'Third star',
                      'reference': 'Schm10'}]
-    with db.engine.connect() as conn:
-        conn.execute(db.Sources.insert().values(sources_data))
-        conn.commit()
+    with db.engine.begin() as conn:
+        conn.execute(db.Sources.insert(), sources_data)
 
 
 def test_orm_use(db):
@@ -189,6 +202,31 @@ Not in DB,WISE_W4,0,WISE,Cutr12
     db.add_table_data(data, 'Photometry', fmt='astropy')
 
 
+def test_csv_table_data_pyarrow(db, tmp_path, monkeypatch):
+    # Files on disk are read with pyarrow when it is installed, which must give the same values as pandas
+    pytest.importorskip('pyarrow')
+    string_data = """source,band,magnitude,magnitude_error,telescope,epoch,comments,reference,extra column
+2MASS J13571237+1428398,WISE_W3,12.48,,WISE,2020-01-01,a comment,Cutr12,blah blah
+FAKE,WISE_W4,,0.5,,,,Cutr12,
+"""
+    filename = os.path.join(tmp_path, 'photometry.csv')
+    with open(filename, 'w') as f:
+        f.write(string_data)
+
+    arrow_df = astrodb._csv_table_data(filename, db.Photometry)
+    monkeypatch.setattr(astrodb, 'pa_csv', None)
+    pandas_df = astrodb._csv_table_data(filename, db.Photometry)
+
+    def records(df):
+        return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+    assert list(arrow_df.columns) == list(pandas_df.columns)
+    assert 'extra column' not in arrow_df.columns
+    assert records(arrow_df) == records(pandas_df)
+    assert records(arrow_df)[1] == {'source': 'FAKE', 'band': 'WISE_W4', 'magnitude': None, 'magnitude_error': 0.5,
+                                    'telescope': None, 'epoch': None, 'comments': None, 'reference': 'Cutr12'}
+
+
 def test_query_data(db):
     # Perform some example queries and confirm the results
     assert db.query(db.Publications).count() == 2
@@ -207,6 +245,8 @@ def test_search_object(mock_simbad, db):
     assert len(t) == 1
     t = db.search_object('engu', fuzzy_search=False)
     assert len(t) == 0
+    t = db.search_object('2mass j13571237+1428398', fuzzy_search=False)
+    assert len(t) == 1
 
     # Test pandas conversion
     t = db.search_object('engu', fmt='pandas')
@@ -239,6 +279,18 @@ def test_search_string(db):
     assert len(d) > 0
     d = db.search_string('2mass', fuzzy_search=False)
     assert len(d) == 0
+    d = db.search_string('fake', fuzzy_search=False)
+    assert sorted(d.keys()) == ['Names', 'Sources']
+
+
+def test_search_exact_non_ascii(file_db):
+    db = file_db
+    with db.engine.begin() as conn:
+        conn.execute(db.Sources.insert(), [{'source': 'Épsilon Star', 'reference': 'Schm10'}])
+
+    assert len(db.search_object('Épsilon Star', fuzzy_search=False)) == 1
+    assert len(db.search_object('ÉPSILON STAR', fuzzy_search=False)) == 1
+    assert list(db.search_string('Épsilon Star', fuzzy_search=False, verbose=False).keys()) == ['Sources']
 
 
 def test_query_region(db):
@@ -283,11 +335,20 @@ def test_sql_query(db):
     assert isinstance(t, Table)
     t = db.sql_query('SELECT * FROM Sources', fmt='pandas')
     assert isinstance(t, pd.DataFrame)
+    t = db.sql_query('SELECT * FROM Sources', fmt='pandas', dtype_backend='numpy_nullable')
+    assert isinstance(t, pd.DataFrame)
+    assert len(t) == 3
+    assert isinstance(t['ra'].dtype, pd.Float64Dtype)
+    t = db.sql_query('SELECT * FROM Instruments', fmt='pandas', dtype_backend='numpy_nullable')
+    assert len(t) == 0
+    with mock.patch.object(pd, '__version__', '1.5.3'), pytest.raises(RuntimeError, match='pandas 2.0'):
+        db.sql_query('SELECT * FROM Sources', fmt='pandas', dtype_backend='numpy_nullable')
     t = db.sql_query('SELECT * FROM Instruments', fmt='astropy')
     assert len(t) == 0
     assert isinstance(t, Table)
-    with pytest.warns(DeprecationWarning):
+    with pytest.warns(DeprecationWarning) as record:
         _ = db.sql_query('SELECT * FROM Sources', format='pandas')
+    assert record[0].filename == __file__  # warning is attributed to the caller
     with pytest.raises(TypeError):
         _ = db.sql_query('SELECT * FROM Sources', format='pandas', fmt='pandas')
 
@@ -340,6 +401,13 @@ def test_query_spectra(mock_spectrum, db):
     assert len(t) == 0
 
 
+def test_spectra_loaders_registered():
+    # Importing astrodb alone makes the astrodbkit formats available to Spectrum1D.read
+    code = ('import astrodbkit.astrodb; from astropy.io import registry; from specutils import Spectrum1D; '
+            'registry.get_reader("Spex Prism", Spectrum1D); registry.get_reader("wcs1d-multispec", Spectrum1D)')
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
 def test_inventory(db):
     # Test the inventory method
     test_dict = {'Sources': [{'source': '2MASS J13571237+1428398',
@@ -368,6 +436,84 @@ def test_inventory(db):
     assert db.inventory('2MASS J13571237+1428398') == test_dict
 
 
+@pytest.fixture
+def file_db(tmp_path):
+    # Small database on disk, which uses a connection pool rather than the single connection of in-memory databases
+    connection_string = 'sqlite:///' + os.path.join(tmp_path, 'file.db')
+    _, _, creation_engine = create_database(connection_string)
+    creation_engine.dispose()
+
+    db = Database(connection_string)
+    with db.engine.begin() as conn:
+        conn.execute(db.Publications.insert(), [{'name': 'Schm10'}])
+        conn.execute(db.Sources.insert(), [{'source': 'S1', 'ra': 10., 'dec': 20., 'reference': 'Schm10'},
+                                           {'source': 'S2', 'ra': 30., 'dec': -40., 'reference': 'Schm10'}])
+
+    yield db
+
+    db.session.close()
+    db.engine.dispose()
+
+
+def test_inventory_cache_default(file_db):
+    # Without a cache size, results always come from the database, including changes made by other connections
+    db = file_db
+    assert list(db.inventory('S1').keys()) == ['Sources']
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO Names (source, other_name) VALUES ('S1', 'Star 1')")
+    assert list(db.inventory('S1').keys()) == ['Sources', 'Names']
+    assert len(db._inventory_cache) == 0
+
+
+def test_inventory_cache_commit(file_db):
+    db = file_db
+    db._inventory_cache_size = 16
+    assert list(db.inventory('S1').keys()) == ['Sources']
+
+    # Rows flushed in the session are included before they are committed, but not cached
+    db.session.execute(db.Names.insert().values(source='S1', other_name='Star 1'))
+    assert list(db.inventory('S1').keys()) == ['Sources', 'Names']
+    assert 'S1' not in db._inventory_cache
+    db.session.commit()
+    assert list(db.inventory('S1').keys()) == ['Sources', 'Names']
+
+    other_db = Database(db.engine.url)
+    assert other_db.inventory('S1') == db.inventory('S1')
+    other_db.session.close()
+    other_db.engine.dispose()
+
+
+def test_inventory_cache_rollback(file_db):
+    db = file_db
+    db._inventory_cache_size = 16
+    assert list(db.inventory('S1').keys()) == ['Sources']
+
+    db.session.execute(db.Names.insert().values(source='S1', other_name='Star 1'))
+    assert list(db.inventory('S1').keys()) == ['Sources', 'Names']
+    db.session.rollback()
+    assert list(db.inventory('S1').keys()) == ['Sources']
+
+
+def test_inventory_cache_read_before_commit(file_db):
+    db = file_db
+    db._inventory_cache_size = 16
+
+    # A read taken while another connection has uncommitted changes must not be served after the commit
+    with db.engine.connect() as conn:
+        conn.execute(db.Names.insert().values(source='S1', other_name='Star 1'))
+        assert list(db.inventory('S1').keys()) == ['Sources']
+        conn.commit()
+    assert list(db.inventory('S1').keys()) == ['Sources', 'Names']
+
+
+def test_inventory_cache_size(file_db):
+    db = file_db
+    db._inventory_cache_size = 1
+    db.inventory('S1')
+    db.inventory('S2')
+    assert list(db._inventory_cache.keys()) == ['S2']
+
+
 def test_views(db):
     # Test database views
 
@@ -447,6 +593,42 @@ def test_save_database(db, db_dir):
     assert data == db.inventory('2MASS J13571237+1428398')
 
 
+def test_save_database_file(file_db, tmp_path):
+    # File databases use a connection pool, so the source files are queried and written by several threads
+    db = file_db
+    with db.engine.begin() as conn:
+        conn.execute(db.Names.insert(), [{'source': 'S1', 'other_name': 'Star 1'}])
+    out_dir = os.path.join(tmp_path, 'json')
+    os.makedirs(out_dir)
+
+    db.save_database(out_dir)
+
+    assert sorted(os.listdir(os.path.join(out_dir, 'source'))) == ['s1.json', 's2.json']
+    for source in ('S1', 'S2'):
+        with open(os.path.join(out_dir, 'source', source.lower() + '.json'), 'r') as f:
+            assert json.load(f) == db.inventory(source)
+
+
+def test_save_database_uncommitted(file_db, tmp_path):
+    # Sources written in the session but not yet committed are saved with their data
+    db = file_db
+    db.session.execute(db.Sources.insert().values(source='S3', ra=50., dec=60., reference='Schm10'))
+    out_dir = os.path.join(tmp_path, 'json')
+    os.makedirs(out_dir)
+
+    db.save_database(out_dir)
+
+    assert sorted(os.listdir(os.path.join(out_dir, 'source'))) == ['s1.json', 's2.json', 's3.json']
+    with open(os.path.join(out_dir, 'source', 's3.json'), 'r') as f:
+        data = json.load(f)
+    assert data['Sources'][0]['ra'] == 50.
+    db.session.rollback()
+
+    # An empty inventory is an error rather than an empty file that cannot be loaded
+    with mock.patch.object(db, '_inventory_data', return_value={}), pytest.raises(RuntimeError):
+        db.save_database(out_dir)
+
+
 def test_load_database(db, db_dir):
     # Test loading database from JSON files
 
@@ -469,6 +651,18 @@ def test_load_database(db, db_dir):
     assert db.query(db.Sources).count() == 3
     assert db.query(db.Sources.c.source).limit(1).all()[0][0] == '2MASS J13571237+1428398'
 
+    # Flush the buffered rows after every source file, so rows of dependent tables are inserted in several batches
+    db.load_database(db_dir, batch_size=1)
+    assert db.query(db.Sources).count() == 3
+    assert db.query(db.Names).count() == 3
+    assert db.query(db.Photometry).count() == 3
+    assert db.query(db.SpectralTypes).count() == 1
+
+    # Parse the source files in worker processes
+    db.load_database(db_dir, processes=2)
+    assert db.query(db.Sources).count() == 3
+    assert db.query(db.Photometry).count() == 3
+
     # Clear temporary directory and files
     for file in os.listdir(db_dir):
         file_path = os.path.join(db_dir, file)
@@ -478,11 +672,37 @@ def test_load_database(db, db_dir):
             shutil.rmtree(file_path)
 
 
-def test_copy_database_schema():
-    connection_1 = 'sqlite:///' + DB_PATH
-    connection_2 = 'sqlite:///second.db'
-    if os.path.exists('second.db'):
-        os.remove('second.db')
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_load_database_nan(file_db, tmp_path, monkeypatch, use_orjson):
+    # Files written by the json module may contain NaN, which orjson rejects; these are read with the json module
+    if use_orjson and astrodb.orjson is None:
+        pytest.skip('orjson is not installed')
+    if not use_orjson:
+        monkeypatch.setattr(astrodb, 'orjson', None)
+
+    db = file_db
+    out_dir = os.path.join(tmp_path, 'json')
+    os.makedirs(out_dir)
+    db.save_database(out_dir)
+    with open(os.path.join(out_dir, 'source', 's1.json'), 'r') as f:
+        data = json.load(f)
+    data['Sources'][0].update(source='S3', ra=float('nan'))
+    with open(os.path.join(out_dir, 'source', 's3.json'), 'w') as f:
+        json.dump(data, f)
+
+    db.load_database(out_dir)
+    assert db.query(db.Sources).count() == 3
+    assert db.query(db.Sources.c.ra).filter(db.Sources.c.source == 'S3').scalar() is None
+
+
+def test_copy_database_schema(db, tmp_path):
+    # Write the in-memory database to a file to serve as the source
+    # Files are kept in a temporary directory so nothing is left behind in the working directory
+    source_path = os.path.join(tmp_path, DB_PATH)
+    db.dump_sqlite(source_path)
+
+    connection_1 = 'sqlite:///' + source_path
+    connection_2 = 'sqlite:///' + os.path.join(tmp_path, 'second.db')
 
     copy_database_schema(connection_1, connection_2, copy_data=True)
 
@@ -493,15 +713,11 @@ def test_copy_database_schema():
     assert db2.query(db2.Publications).count() == 2
     assert db2.query(db2.Sources.c.source).limit(1).all()[0][0] == '2MASS J13571237+1428398'
 
-    # Close the database and delete the temporary secondary file
+    # Close the database
     db2.session.close()
     db2.engine.dispose()
-    if os.path.exists('second.db'):
-        os.remove('second.db')
 
 
 def test_remove_database(db):
     db.session.close()
     db.engine.dispose()
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
@@ -1,14 +1,21 @@
 # Tests for spectra functions
 
+import os
+
+import astropy.units as u
 import numpy as np
 import pytest
 from astropy.io import fits
 from astropy.units import Unit
+from specutils import Spectrum1D
 
+from astrodbkit import spectra
 from astrodbkit.spectra import (
     _identify_spex,
+    _read_header,
     identify_spex_prism,
     identify_wcs1d_multispec,
+    load_spectra,
     load_spectrum,
     spex_prism_loader,
     wcs1d_multispec_loader,
@@ -155,7 +162,163 @@ def test_load_spectrum(mock_spectrum1d, monkeypatch):
     mock_spectrum1d.assert_called_with("/User/path/to/my/fake_file.txt")
 
 
+@mock.patch("astrodbkit.spectra.Spectrum1D.read")
+def test_load_spectra(mock_spectrum1d):
+    mock_spectrum1d.side_effect = lambda filename, **kwargs: filename.upper()
+    spectra = load_spectra(["file1.fits", "file2.fits", "file3.fits"], spectra_format="SpeX", max_workers=2)
+    assert spectra == ["FILE1.FITS", "FILE2.FITS", "FILE3.FITS"]
+    mock_spectrum1d.assert_any_call("file2.fits", format="SpeX")
+    assert mock_spectrum1d.call_count == 3
+
+
+def test_load_spectra_processes(tmp_path):
+    # Spectra read in worker processes are rebuilt in this process
+    data = np.array([np.arange(1, 10), np.arange(11, 20), np.arange(21, 30)], dtype=np.float64)
+    hdr = fits.Header()
+    hdr["TELESCOP"] = "NASA IRTF"
+    hdr["INSTRUME"] = "SPeX, IRTF Spectrograph"
+    hdr["GRAT"] = "LowRes15 "
+    hdr["XUNITS"] = "Microns "
+    hdr["YUNITS"] = "ergs s-1 cm-2 A-1"
+    filename = str(tmp_path / "spex.fits")
+    fits.PrimaryHDU(data, header=hdr).writeto(filename)
+    missing = str(tmp_path / "missing.fits")
+
+    spectra = load_spectra([filename, missing], spectra_format="Spex Prism", max_workers=2, use_processes=True)
+    expected = spex_prism_loader(filename)
+    assert isinstance(spectra[0], Spectrum1D)
+    assert u.allclose(spectra[0].flux, expected.flux)
+    assert u.allclose(spectra[0].spectral_axis, expected.spectral_axis)
+    assert u.allclose(spectra[0].uncertainty.quantity, expected.uncertainty.quantity)
+    assert spectra[0].meta["header"]["TELESCOP"] == "NASA IRTF"
+    assert spectra[1] == missing
+
+
 def test_load_spectrum_error():
     # Test error handling
     with pytest.raises(TypeError):
         _ = load_spectrum("fake_file.fits", raise_error=True)
+
+
+@pytest.mark.parametrize("use_fitsio", [True, False])
+def test_spex_prism_loader_scaled_file(tmp_path, monkeypatch, use_fitsio):
+    # Unsigned integer data is stored as int16 with BZERO=32768 and must be scaled on read
+    if use_fitsio and spectra.fitsio is None:
+        pytest.skip("fitsio is not installed")
+    if not use_fitsio:
+        monkeypatch.setattr(spectra, "fitsio", None)
+
+    data = np.array([np.arange(1, 10), np.arange(40000, 40009), np.arange(1, 10)], dtype=np.uint16)
+    hdr = fits.Header()
+    hdr["TELESCOP"] = "NASA IRTF"
+    hdr["INSTRUME"] = "SPeX, IRTF Spectrograph"
+    hdr["GRAT"] = "LowRes15 "
+    hdr["XUNITS"] = "Microns "
+    hdr["YUNITS"] = "ergs s-1 cm-2 A-1"
+    hdr["OBJECT"] = "A long object name " * 8  # written over several CONTINUE cards
+    filename = str(tmp_path / "spex_uint16.fits")
+    fits.PrimaryHDU(data, header=hdr).writeto(filename)
+
+    spectrum = spex_prism_loader(filename)
+    assert np.array_equal(spectrum.flux.value, np.arange(40000, 40009))
+    assert np.array_equal(spectrum.spectral_axis.value, np.arange(1, 10))
+    assert spectrum.meta["header"]["OBJECT"] == hdr["OBJECT"]
+
+
+def test_wcs1d_multispec_loader_blank_file(tmp_path):
+    # Integer data with BLANK values is converted to floats with NaN for the blanks
+    data = np.arange(40, dtype=np.int16).reshape((4, 1, 10))
+    data[0, 0, 3] = -999
+    hdr = fits.Header()
+    hdr["WCSDIM"] = 3
+    hdr["WAT0_001"] = "system=equispec"
+    hdr["WAT1_001"] = "wtype=linear label=Wavelength units=angstroms"
+    hdr["BANDID1"] = "spectrum - background fit"
+    hdr["BANDID4"] = "sigma - background fit"
+    hdr["CTYPE1"] = "LINEAR  "
+    hdr["BUNIT"] = "erg/cm2/s/A"
+    hdr["CRVAL1"] = 5000.0
+    hdr["CDELT1"] = 2.5
+    hdu = fits.PrimaryHDU(data, header=hdr)
+    hdu.header["BSCALE"] = 0.5
+    hdu.header["BZERO"] = 10.0
+    hdu.header["BLANK"] = -999
+    filename = str(tmp_path / "wcs1d_blank.fits")
+    hdu.writeto(filename)
+
+    spectrum = wcs1d_multispec_loader(filename)
+    expected = np.arange(10) * 0.5 + 10.0
+    expected[3] = np.nan
+    assert np.allclose(spectrum.flux.value, expected, equal_nan=True)
+    assert np.allclose(spectrum.uncertainty.array, np.arange(30, 40) * 0.5 + 10.0)
+
+
+@pytest.mark.parametrize("use_fitsio", [True, False])
+def test_read_header_changed_file(tmp_path, monkeypatch, use_fitsio):
+    # Cached headers of local files are read again when the file is rewritten
+    if use_fitsio and spectra.fitsio is None:
+        pytest.skip("fitsio is not installed")
+    if not use_fitsio:
+        monkeypatch.setattr(spectra, "fitsio", None)
+
+    filename = str(tmp_path / "header.fits")
+    hdr = fits.Header()
+    hdr["OBJECT"] = "first"
+    fits.PrimaryHDU(np.zeros(10), header=hdr).writeto(filename)
+    assert _read_header(filename)["OBJECT"] == "first"
+
+    hdr["OBJECT"] = "second"
+    hdr["TELESCOP"] = "NASA IRTF"
+    fits.PrimaryHDU(np.zeros(20), header=hdr).writeto(filename, overwrite=True)
+    stat = os.stat(filename)
+    os.utime(filename, (stat.st_atime, stat.st_mtime + 10))
+    assert _read_header(filename)["OBJECT"] == "second"
+
+
+@pytest.mark.parametrize("use_fitsio", [True, False])
+def test_identify_wcs1d_multispec_file(tmp_path, monkeypatch, use_fitsio):
+    # Local files are identified from their header alone
+    if use_fitsio and spectra.fitsio is None:
+        pytest.skip("fitsio is not installed")
+    if not use_fitsio:
+        monkeypatch.setattr(spectra, "fitsio", None)
+
+    hdr = fits.Header()
+    hdr["WCSDIM"] = 3
+    hdr["WAT0_001"] = "system=equispec"
+    hdr["CTYPE1"] = "LINEAR  "
+    filename = str(tmp_path / "wcs1d.fits")
+    fits.PrimaryHDU(np.zeros((4, 1, 10)), header=hdr).writeto(filename)
+    assert identify_wcs1d_multispec("read", filename)
+
+    del hdr["WAT0_001"]
+    filename = str(tmp_path / "no_wat0.fits")
+    fits.PrimaryHDU(np.zeros((4, 1, 10)), header=hdr).writeto(filename)
+    assert not identify_wcs1d_multispec("read", filename)
+
+    filename = str(tmp_path / "not_fits.fits")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("not a FITS file")
+    assert not identify_wcs1d_multispec("read", filename)
+
+
+def test_wcs1d_multispec_loader_cd_file(tmp_path):
+    # Headers with a CD matrix instead of CDELT1 use the full WCS for the spectral axis
+    hdr = fits.Header()
+    hdr["WCSDIM"] = 3
+    hdr["WAT0_001"] = "system=equispec"
+    hdr["WAT1_001"] = "wtype=linear label=Wavelength units=angstroms"
+    hdr["BANDID1"] = "spectrum - background fit"
+    hdr["CTYPE1"] = "LINEAR  "
+    hdr["CRVAL1"] = 5000.0
+    hdr["CRPIX1"] = 1.0
+    hdr["CD1_1"] = 2.5
+    hdr["CD2_2"] = 1.0
+    hdr["CD3_3"] = 1.0
+    filename = str(tmp_path / "wcs1d_cd.fits")
+    fits.PrimaryHDU(np.arange(40, dtype=np.float64).reshape((4, 1, 10)), header=hdr).writeto(filename)
+
+    spectrum = wcs1d_multispec_loader(filename)
+    assert spectrum.spectral_axis.unit == u.AA
+    assert np.allclose(spectrum.spectral_axis.value, 5000.0 + 2.5 * np.arange(10))
+    assert np.array_equal(spectrum.flux.value, np.arange(10))
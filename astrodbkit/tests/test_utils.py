@@ -1,14 +1,26 @@
 # Testing for utils
 
 import json
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from io import StringIO
 
+import numpy as np
 import pytest
 from astropy.table import Table
+from sqlalchemy import create_engine, text
 
-from astrodbkit.utils import _name_formatter, datetime_json_parser, get_simbad_names, json_serializer
+from astrodbkit import utils
+from astrodbkit.utils import (
+    _name_formatter,
+    apply_datetime_json_parser,
+    datetime_json_parser,
+    dump_json,
+    get_simbad_names,
+    get_simbad_names_bulk,
+    json_serializer,
+)
 
 try:
     import mock
@@ -20,7 +32,9 @@ except ImportError:
     ('TWA  27', 'TWA 27'),
     ('HIDDEN A', None),
     ('V* V4046 Sgr', 'V4046 Sgr'),
-    ('** CVN   12A', 'CVN 12A')
+    ('** CVN   12A', 'CVN 12A'),
+    ('NAME Betelgeuse', 'Betelgeuse'),
+    ('Cl* Melotte 22 SSHJ G4-1', 'Melotte 22 SSHJ G4-1'),
 ])
 def test_name_formatter(test_input, expected):
     assert _name_formatter(test_input) == expected
@@ -42,13 +56,75 @@ def test_json_serializer():
     assert new_data['bytes'] == 'byte'
 
 
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_dump_json(use_orjson):
+    data = {'date': datetime(2018, 12, 6, 12, 30, 0),
+            'value': Decimal('2.5'),
+            'bytes': b'byte',
+            'list': [1, 'two']}
+
+    orjson = utils.orjson if use_orjson else None
+    if use_orjson and orjson is None:
+        pytest.skip('orjson is not installed')
+    with mock.patch('astrodbkit.utils.orjson', orjson):
+        json_text = dump_json(data)
+
+    assert json.loads(json_text) == {'date': '2018-12-06T12:30:00', 'value': 2.5, 'bytes': 'byte', 'list': [1, 'two']}
+
+
+def test_dump_json_backends():
+    # Both backends give the same output
+    if utils.orjson is None:
+        pytest.skip('orjson is not installed')
+    data = {'name': 'Béta Pictoris ★',
+            'date': datetime(2018, 12, 6, 12, 30, 0, 500),
+            'value': Decimal('2.5'),
+            'missing': [float('nan'), float('inf'), -float('inf'), 1.5],
+            'array': np.array([[1.5, np.nan], [3.0, 4.25]]),
+            'scalar': np.float32(0.5),
+            'nested': ({'flag': True, 'none': None}, 10)}
+
+    json_text = dump_json(data)
+    with mock.patch('astrodbkit.utils.orjson', None):
+        assert dump_json(data) == json_text
+    assert json.loads(json_text)['missing'] == [None, None, None, 1.5]
+
+
+def test_json_serializer_rows():
+    @dataclass
+    class Point:
+        ra: float
+        dec: float
+
+    engine = create_engine('sqlite://')
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT 'TWA 27' AS source, 181.89 AS ra")).one()
+
+    data = {'row': row, 'point': Point(1.5, -2.5)}
+    new_data = json.loads(json.dumps(data, default=json_serializer))
+    engine.dispose()
+
+    assert new_data['row'] == {'source': 'TWA 27', 'ra': 181.89}
+    assert new_data['point'] == {'ra': 1.5, 'dec': -2.5}
+
+
 def test_datetime_json_parser():
-    json_dict = {'date': '2018-12-06T12:30:00', 'name': 'TWA 23', 'number': 4.5}
+    json_dict = {'date': '2018-12-06T12:30:00', 'name': 'TWA 23', 'number': 4.5, 'code': '20181206'}
     new_dict = datetime_json_parser(json_dict)
     assert new_dict['date'] == datetime.fromisoformat('2018-12-06T12:30:00')
     assert isinstance(new_dict['date'], datetime)
     assert isinstance(new_dict['name'], str)
     assert isinstance(new_dict['number'], float)
+    assert new_dict['code'] == '20181206'
+
+
+def test_apply_datetime_json_parser():
+    text = '{"source": "TWA 23", "Observations": [{"date": "2018-12-06T12:30:00", "nested": {"date": "2020-01-01"}}]}'
+    data = apply_datetime_json_parser(json.loads(text))
+    assert data == json.loads(text, object_hook=datetime_json_parser)
+    assert isinstance(data['Observations'][0]['date'], datetime)
+    assert isinstance(data['Observations'][0]['nested']['date'], datetime)
+    assert data['source'] == 'TWA 23'
 
 
 @mock.patch('astrodbkit.utils.Simbad.query_objectids')
@@ -58,8 +134,28 @@ def test_get_simbad_names(mock_simbad):
     assert len(t) == 3
     assert t[2] == 'name 3'
 
+    # Repeated lookups of the same name are served from the cache
+    t = get_simbad_names('TWA  27')
+    assert len(t) == 3
+    assert mock_simbad.call_count == 1
+
     # Example with no Simbad match
     mock_simbad.return_value = None
     t = get_simbad_names('WISEU J005559.88+594745.0')
     assert len(t) == 1
     assert t[0] == 'WISEU J005559.88+594745.0'
+
+
+@mock.patch('astrodbkit.utils._simbad_ids_service')
+def test_get_simbad_names_bulk(mock_service):
+    mock_service.return_value.query_objects.return_value = Table({
+        'user_specified_id': ['twa 27', 'wiseu j005559.88+594745.0'],
+        'ids': ['name 1|V* name 2|HIDDEN name', ''],
+    })
+    t = get_simbad_names_bulk(['TWA  27', 'twa 27', 'WISEU J005559.88+594745.0'])
+    mock_service.return_value.query_objects.assert_called_once_with(['twa 27', 'wiseu j005559.88+594745.0'])
+    assert t['TWA  27'] == ['name 1', 'name 2']
+    assert t['twa 27'] == ['name 1', 'name 2']
+
+    # Example with no Simbad match
+    assert t['WISEU J005559.88+594745.0'] == ['WISEU J005559.88+594745.0']
@@ -1,14 +1,27 @@
 """Utility functions for Astrodbkit"""
 
+import dataclasses
 import functools
+import json
+import math
 import re
 import warnings
 from datetime import datetime
 from decimal import Decimal
 
-from astroquery.simbad import Simbad
+from astroquery.simbad import Simbad, SimbadClass
 
-__all__ = ["json_serializer", "get_simbad_names"]
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+    _parse_datetime = datetime.fromisoformat
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ["json_serializer", "dump_json", "get_simbad_names", "get_simbad_names_bulk"]
 
 
 def deprecated_alias(**aliases):
@@ -19,10 +32,15 @@ def deprecated_alias(**aliases):
     To use: add @deprecated_alias(old_name='new_name')
     """
 
+    alias_names = frozenset(aliases)
+    messages = {alias: f"{alias} is deprecated; use {new}" for alias, new in aliases.items()}
+
     def deco(f):
         @functools.wraps(f)
         def wrapper(*args, **kwargs):
-            rename_kwargs(f.__name__, kwargs, aliases)
+            # Most calls use no deprecated names, so only then are the aliases checked one by one
+            if not alias_names.isdisjoint(kwargs):
+                rename_kwargs(f.__name__, kwargs, aliases, messages)
             return f(*args, **kwargs)
 
         return wrapper
@@ -30,49 +48,128 @@ def deprecated_alias(**aliases):
     return deco
 
 
-def rename_kwargs(func_name, kwargs, aliases):
-    """Helper function used be deprecated_alias"""
+def rename_kwargs(func_name, kwargs, aliases, messages=None):
+    """Helper function used be deprecated_alias; the warnings point to the caller of the decorated function"""
     for alias, new in aliases.items():
         if alias in kwargs:
             if new in kwargs:
                 raise TypeError(f"{func_name} received both {alias} and {new}")
-            warnings.warn(f"{alias} is deprecated; use {new}", DeprecationWarning)
+            message = messages[alias] if messages is not None else f"{alias} is deprecated; use {new}"
+            warnings.warn(message, DeprecationWarning, stacklevel=3)
             kwargs[new] = kwargs.pop(alias)
 
 
-def json_serializer(obj):
+# Serializers for types not supported by json, looked up by exact type in json_serializer
+_JSON_SERIALIZERS = {
+    datetime: lambda obj: obj.isoformat(),
+    Decimal: float,
+    bytes: bytes.decode,
+}
+
+
+def json_serializer(obj, _serializers=_JSON_SERIALIZERS):
     """Function describing how things should be serialized in JSON.
-    Datetime objects are saved with datetime.isoformat(), Parameter class objects use clean_dict()
-    while all others use __dict__"""
+    Datetime objects are saved with datetime.isoformat(), SQLAlchemy rows and dataclasses are converted to dictionaries,
+    while all others use __dict__.
+    The handlers are bound as a default argument, a local lookup, since json calls this once per unsupported value."""
+
+    serializer = _serializers.get(type(obj))
+    if serializer is None:
+        # Subclasses of the supported types (eg, pandas Timestamp) are matched once and then cached by type
+        serializer = next((f for t, f in list(_serializers.items()) if isinstance(obj, t)), None)
+        if serializer is None:
+            # SQLAlchemy rows define __slots__ rather than __dict__ but expose their values through _mapping
+            if hasattr(obj, "_mapping"):
+                return dict(obj._mapping)  # pylint: disable=protected-access
+            if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+                return dataclasses.asdict(obj)
+            return obj.__dict__
+        _serializers[type(obj)] = serializer
+
+    return serializer(obj)
+
+
+def _finite_or_none(obj):
+    """Replace NaN and infinite floats in nested lists and dictionaries by None, as orjson writes them as null"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite_or_none(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(value) for value in obj]
+    return obj
+
+
+def _dump_json_serializer(obj):
+    """json_serializer for dump_json without orjson, converting numpy arrays and scalars like orjson does"""
+    if hasattr(obj, "tolist"):
+        return _finite_or_none(obj.tolist())
+    return _finite_or_none(json_serializer(obj))
+
+
+def dump_json(data):
+    """
+    Serialize data to a compact JSON string, using orjson when it is installed.
+    orjson handles datetimes and numpy arrays natively so json_serializer is only called for other types.
+    Without orjson, the json module gives the same output: non-ASCII characters are not escaped and NaN or infinite
+    values are written as null. Floats may still be formatted differently (eg, 1e-05 rather than 1e-5).
+    The output is not formatted like the files written by `Database.save_database`, which always use the json module.
 
-    if isinstance(obj, datetime):
-        return obj.isoformat()
+    Parameters
+    ----------
+    data : object
+        Data to serialize
 
-    if isinstance(obj, Decimal):
-        return float(obj)
+    Returns
+    -------
+    JSON string
+    """
 
-    if isinstance(obj, bytes):
-        return obj.decode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(data, default=json_serializer, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(_finite_or_none(data), default=_dump_json_serializer, separators=(",", ":"), ensure_ascii=False)
 
-    return obj.__dict__
 
+# Only strings starting with an ISO date (YYYY-MM-DD) are attempted as datetimes
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}").match
 
-def datetime_json_parser(json_dict):
+
+def datetime_json_parser(json_dict, _is_date=_ISO_DATE, _parse=_parse_datetime):
     """Function to convert JSON dictionary objects to datetime when possible.
     This is required to get datetime objects into the database.
     Adapted from: https://stackoverflow.com/questions/8793448/how-to-convert-to-a-python-datetime-object-with-json-loads
+    The dictionary is updated in place, and only for the values that are converted.
+    The date check and parser are bound as default arguments since this runs for every decoded JSON object.
     """
     for key, value in json_dict.items():
-        if isinstance(value, str):
+        if isinstance(value, str) and _is_date(value):
             try:
-                json_dict[key] = datetime.fromisoformat(value)
+                json_dict[key] = _parse(value)
             except (ValueError, AttributeError):
                 pass
-        else:
-            pass
     return json_dict
 
 
+def apply_datetime_json_parser(data):
+    """Apply datetime_json_parser to every dictionary of already decoded JSON data, for parsers without object_hook.
+    The nested containers are walked with a stack rather than recursion.
+    """
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            stack.extend(v for v in obj.values() if isinstance(v, (dict, list)))
+            datetime_json_parser(obj)
+        elif isinstance(obj, list):
+            stack.extend(v for v in obj if isinstance(v, (dict, list)))
+    return data
+
+
+# Patterns used by _name_formatter, defined once rather than on every call
+_HIDDEN = re.compile("HIDDEN", re.IGNORECASE)
+_SIMBAD_TYPES = re.compile("|".join(re.escape(t) for t in ("V* ", "EM* ", "NAME ", "** ", "Cl* ", "* ")))
+
+
 def _name_formatter(name):
     """
     Clean up names of spurious formatting (extra spaces, some special characters)
@@ -87,18 +184,19 @@ def _name_formatter(name):
     Cleaned up name
     """
 
-    # Clean up multiple spaces
-    name = re.sub(r"\s\s+", " ", name)
+    # Clean up multiple spaces; the only whitespace isprintable() allows is a single space,
+    # so most names are already clean
+    if "  " in name or not name.isprintable():
+        name = " ".join(name.split())
 
-    # Clean up Simbad types
-    strings_to_delete = ["V* ", "EM* ", "NAME ", "** ", "Cl* ", "* "]
-    for pattern in strings_to_delete:
-        name = name.replace(pattern, "")
+    # Clean up Simbad types, all removed in a single pass over the name; every type ends in '* ' or is 'NAME '
+    if "* " in name or "NAME " in name:
+        name = _SIMBAD_TYPES.sub("", name)
 
     name = name.strip()
 
     # Clean up 'hidden' names from Simbad
-    if "HIDDEN" in name.upper():
+    if _HIDDEN.search(name):
         name = None
 
     return name
@@ -120,11 +218,71 @@ def get_simbad_names(name, verbose=False):
     List of names
     """
 
-    t = Simbad.query_objectids(name)
-    if t is not None and len(t) > 0:
-        temp = [_name_formatter(s) for s in t["ID"].tolist()]
-        return [s for s in temp if s is not None and s != ""]
+    names = _query_simbad_ids(" ".join(name.split()).lower())
+    if names is not None:
+        return list(names)
     else:
         if verbose:
             print(f"No Simbad match for {name}")
         return [name]
+
+
+@functools.lru_cache(maxsize=4096)
+def _query_simbad_ids(name):
+    """
+    Query Simbad for the identifiers of an object, cleaned up with `_name_formatter`; None if there is no match.
+    Results are cached by normalized name since every query is a network request; use cache_clear() to reset.
+    The identifiers are formatted once here so cached lookups return them directly.
+    """
+
+    t = Simbad.query_objectids(name)
+    if t is None or len(t) == 0:
+        return None
+    return tuple(s for s in map(_name_formatter, t["ID"].tolist()) if s)
+
+
+def get_simbad_names_bulk(names, verbose=False):
+    """
+    Get lists of alternate names from Simbad for several objects with a single query
+
+    Parameters
+    ----------
+    names : list of str
+        Names to resolve
+    verbose : bool
+        Verbosity flag
+
+    Returns
+    -------
+    Dictionary of lists of names, keyed by the provided names
+    """
+
+    # Names are normalized as in get_simbad_names and each distinct name is only sent once
+    keys = {name: " ".join(name.split()).lower() for name in names}
+    t = _simbad_ids_service().query_objects(list(dict.fromkeys(keys.values())))
+
+    # Simbad returns one row per requested name, with all identifiers separated by '|'
+    found = {}
+    if t is not None:
+        for key, ids in zip(t["user_specified_id"].tolist(), t["ids"].tolist()):
+            if ids:
+                found[key] = tuple(s for s in map(_name_formatter, ids.split("|")) if s)
+
+    output = {}
+    for name, key in keys.items():
+        if key in found:
+            output[name] = list(found[key])
+        else:
+            if verbose:
+                print(f"No Simbad match for {name}")
+            output[name] = [name]
+    return output
+
+
+@functools.lru_cache(maxsize=1)
+def _simbad_ids_service():
+    """Simbad interface that also returns all identifiers of each object, created on first use"""
+
+    simbad = SimbadClass()
+    simbad.add_votable_fields("ids")
+    return simbad